@@ -15,6 +15,8 @@
 
 """vmap base functions"""
 
+from collections import OrderedDict
+
 import mindspore.numpy as mnp
 from mindspore.ops import operations as P
 from mindspore.ops import functional as F
@@ -39,9 +41,8 @@ def get_vmap_rule(prim, axis_size):
     return vmap_rules.get(prim, None)
 
 
-@constexpr
-def _get_broadcast_shape_without_axis(x_shape, y_shape):
-    """Get the broadcast shape for _handle_broadcasting."""
+def _calc_broadcast_shape_without_axis(x_shape, y_shape):
+    """Calculate the broadcast shape of `x_shape` against `y_shape`, ignoring the batch axis."""
     x_len = len(x_shape)
     y_len = len(y_shape)
 
@@ -68,12 +69,33 @@ def _get_broadcast_shape_without_axis(x_shape, y_shape):
     return finnal_shape
 
 
+@constexpr
+def _get_broadcast_shape_without_axis(x_shape, y_shape):
+    """Get the broadcast shape for _handle_broadcasting."""
+    return _calc_broadcast_shape_without_axis(x_shape, y_shape)
+
+
+@constexpr
+def _get_broadcast_shapes_without_axis(x_shapes, y_shape):
+    """Get the broadcast shapes for _handle_broadcasting_many."""
+    return tuple(_calc_broadcast_shape_without_axis(x_shape, y_shape) for x_shape in x_shapes)
+
+
 def _handle_broadcasting(x, x_shape, y_shape):
     """Handle the broadcasting shape."""
     broadcast_shape = _get_broadcast_shape_without_axis(x_shape, y_shape)
     return F.reshape(x, broadcast_shape)
 
 
+def _handle_broadcasting_many(inputs, inputs_shape, y_shape):
+    """Handle the broadcasting shape of several inputs which share the same target shape."""
+    broadcast_shapes = _get_broadcast_shapes_without_axis(inputs_shape, y_shape)
+    outputs = ()
+    for x, broadcast_shape in zip(inputs, broadcast_shapes):
+        outputs = outputs + (F.reshape(x, broadcast_shape),)
+    return outputs
+
+
 @constexpr
 def _raise_value_error(info, param=None):
     """Constexpr for raise_value_error."""
@@ -384,6 +406,43 @@ def _vmap_clone_prim(prim):
     return cloned
 
 
+# The cached batch primitives are shared by every vmap rule that asks for an equal primitive, so apart from the
+# instance name, which follows the requesting primitive, they must be treated as read-only: an attribute added to one
+# of them later would leak into the other rules.
+_VMAP_BATCH_PRIM_CACHE_SIZE = 256
+_vmap_batch_prim_cache = OrderedDict()
+
+
+def _vmap_get_batch_prim(prim, batch_rank):
+    """
+    Get a primitive object same as `prim` with the attribute `batch_rank`.
+    The cloned primitive is cached and reused for primitives with the same name, attributes and `batch_rank`,
+    keeping at most `_VMAP_BATCH_PRIM_CACHE_SIZE` of the most recently used ones. The instance name is unique for
+    each primitive, so it is not part of the key and is set on the returned primitive instead. The returned
+    primitive must not be modified otherwise.
+    """
+    try:
+        key = (prim.name, batch_rank, tuple(sorted(prim.attrs.items())))
+        batch_prim = _vmap_batch_prim_cache.get(key, None)
+    except TypeError:
+        # Some attributes are not hashable, the primitive can not be cached.
+        key = None
+        batch_prim = None
+    if batch_prim is not None:
+        _vmap_batch_prim_cache.move_to_end(key)
+        if hasattr(prim, 'instance_name'):
+            batch_prim.set_prim_instance_name(prim.instance_name)
+        return batch_prim
+
+    batch_prim = _vmap_clone_prim(prim)
+    batch_prim.add_prim_attr("batch_rank", batch_rank)
+    if key is not None:
+        _vmap_batch_prim_cache[key] = batch_prim
+        if len(_vmap_batch_prim_cache) > _VMAP_BATCH_PRIM_CACHE_SIZE:
+            _vmap_batch_prim_cache.popitem(last=False)
+    return batch_prim
+
+
 _ops_vmap_clone_prim_dict = {"ApplyAdaMax": P.ApplyAdaMax,
                              "ApplyAdadelta": P.ApplyAdadelta,
                              "ApplyFtrl": P.ApplyFtrl,
@@ -16,6 +16,8 @@
 """nn_ops vmap impl."""
 from __future__ import absolute_import
 
+import functools
+
 import mindspore
 from mindspore.common import Tensor
 from mindspore.ops import operations as P
@@ -24,9 +26,89 @@ from mindspore.ops.operations import nn_ops as NN
 from mindspore.ops import functional as F
 from mindspore.ops import constexpr
 from .._vmap.vmap_base import vmap_rules_getters, vmap_general_preprocess, get_unop_vmap_rule, \
-    _bdim_at_front, _bdim_at_back, _handle_broadcasting, \
-    get_unary_grad_vmap_rule, _raise_value_error, _vmap_clone_prim
+    _bdim_at_front, _bdim_at_back, _handle_broadcasting_many, \
+    get_unary_grad_vmap_rule, _raise_value_error, _vmap_get_batch_prim
 from ..primitive import Primitive
+from .._utils.utils import is_shape_known
+
+# The reduce indexes (all axes but the batch axis) of the batched losses, indexed by rank.
+_REDUCE_INDEXES = tuple(tuple(range(1, rank)) for rank in range(9))
+
+
+def _get_reduce_indexes(rank):
+    """Get the indexes to reduce for a batched loss of `rank`, excluding the batch axis."""
+    if rank < len(_REDUCE_INDEXES):
+        return _REDUCE_INDEXES[rank]
+    return tuple(range(1, rank))
+
+
+_reduce_mean = P.ReduceMean()
+_reduce_sum = P.ReduceSum()
+_div = P.Div()
+_bce_with_logits_loss_none = NN.BCEWithLogitsLoss('none')
+_kl_div_loss_none = P.KLDivLoss('none')
+
+
+@functools.lru_cache(maxsize=None)
+def _get_smooth_l1_loss_none(beta):
+    """Get the `SmoothL1Loss` primitive with reduction 'none' for the given `beta`."""
+    return P.SmoothL1Loss(beta, 'none')
+
+
+@functools.lru_cache(maxsize=None)
+def _get_kl_div_loss_grad(reduction):
+    """Get the `KLDivLossGrad` primitive for the given `reduction`."""
+    return G.KLDivLossGrad(reduction=reduction)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_smooth_l1_loss_grad(beta, reduction):
+    """Get the `SmoothL1LossGrad` primitive for the given `beta` and `reduction`."""
+    return G.SmoothL1LossGrad(beta, reduction)
+
+
+def _maybe_bdim_at_front(x, src, axis_size):
+    """Like `_bdim_at_front`, but returns `x` directly if its source axis is already the foremost."""
+    if src == 0:
+        return x
+    return _bdim_at_front(x, src, axis_size)
+
+
+def _reshape_call_reshape(prim, inputs, input_shape, get_output_shape, *args):
+    """
+    Reshape all `inputs` to `input_shape`, call `prim` with them followed by `args`, and reshape every output of
+    `prim` back to the shape returned by `get_output_shape`, which receives the first output. The shape of the
+    output is only queried by the callbacks that need it.
+    """
+    reshaped_inputs = ()
+    for x in inputs:
+        reshaped_inputs = reshaped_inputs + (F.reshape(x, input_shape),)
+    out = prim(*(reshaped_inputs + args))
+    if isinstance(out, tuple):
+        output_shape = get_output_shape(out[0])
+        outputs = ()
+        for item in out:
+            outputs = outputs + (F.reshape(item, output_shape),)
+        return outputs
+    return F.reshape(out, get_output_shape(out))
+
+
+@constexpr
+def _get_trailing_collapsed_shape(shape, keep_prefix):
+    """Get the shape which keeps the first `keep_prefix` dims of `shape` and collapses the others into -1."""
+    return shape[:keep_prefix] + (-1,)
+
+
+@constexpr
+def _get_leading_collapsed_shape(shape, keep_index):
+    """Get the shape which keeps the dims of `shape` from `keep_index` and collapses the leading ones into -1."""
+    return (-1,) + shape[keep_index:]
+
+
+@constexpr
+def _get_log_softmax_batch_axis(axis, x_dim):
+    """Get the axis of the batched input for `LogSoftmax` from the normalized `axis` of the unbatched input."""
+    return axis if axis < x_dim else axis + 1
 
 
 @vmap_rules_getters.register(P.ApplyAdaMax)
@@ -37,32 +119,26 @@ def get_apply_ada_max_rule(prim, axis_size):
     else:
         batch_rank = 1
     prim_name = prim.name
-    batch_prim = _vmap_clone_prim(prim)
-    batch_prim.add_prim_attr("batch_rank", batch_rank)
+    batch_prim = _vmap_get_batch_prim(prim, batch_rank)
 
     def vmap_rule(var_bdim, m_bdim, v_bdim, beta1_power_bdim, lr_bdim, beta1_bdim, beta2_bdim,
                   epsilon_bdim, grad_bdim, u_monad):
-        var, var_dim = var_bdim
-        m, m_dim = m_bdim
-        v, v_dim = v_bdim
-        lr, lr_dim = lr_bdim
-        beta1_power, beta1_power_dim = beta1_power_bdim
-        beta1, beta1_dim = beta1_bdim
-        beta2, beta2_dim = beta2_bdim
-        epsilon, epsilon_dim = epsilon_bdim
-        grad, grad_dim = grad_bdim
+        inputs, dims = zip(*(var_bdim, m_bdim, v_bdim, beta1_power_bdim, lr_bdim, beta1_bdim, beta2_bdim,
+                             epsilon_bdim, grad_bdim))
+        var, m, v, beta1_power, lr, beta1, beta2, epsilon, grad = inputs
+        var_dim, m_dim, v_dim, beta1_power_dim, lr_dim, beta1_dim, beta2_dim, epsilon_dim, grad_dim = dims
 
         if var_dim is None:
-            if any(dim is not None for dim in [m_bdim, v_bdim, beta1_power_bdim, lr_bdim, beta1_bdim, beta2_bdim,
-                                               epsilon_bdim, grad_bdim]):
+            if any(dim is not None for dim in dims[1:]):
                 raise ValueError("The source axis of `var` is None, but the source "
                                  "axis of `accum/lr/beta1/beta1_power/beta2/epsilon/grad` is not None. "
                                  "The execution order of operator `{}` cannot be guaranteed.".format(prim_name))
             var, m, v = prim(var, m, v, beta1_power, lr, beta1, beta2, epsilon, grad, u_monad)
             return (var, None), (m, None), (v, None)
         if var_dim != 0 or m_dim != var_dim or var_dim != v_dim:
-            raise ValueError("For `{}`, the source axis of `var` must be equal to `accum`, and not equal to 0, "
-                             "but got the source axis of `var`: {}, `accum`: {}.".format(prim_name, var_dim, m_dim))
+            raise ValueError("For `{}`, the source axis of `var/m/v` must be 0, "
+                             "but got the source axis of `var`: {}, `m`: {}, `v`: {}.".format(prim_name, var_dim,
+                                                                                            m_dim, v_dim))
 
         lr = _bdim_at_front(lr, lr_dim, axis_size)
         beta1_power = _bdim_at_front(beta1_power, beta1_power_dim, axis_size)
@@ -85,28 +161,23 @@ def get_apply_adadelta_rule(prim, axis_size):
         batch_rank = 1
 
     prim_name = prim.name
-    batch_prim = _vmap_clone_prim(prim)
-    batch_prim.add_prim_attr('batch_rank', batch_rank)
+    batch_prim = _vmap_get_batch_prim(prim, batch_rank)
 
     def vmap_rule(var_bdim, accum_bdim, accum_update_bdim, lr_bdim, rho_bdim, epsilon_bdim, grad_bdim, u_monad):
-        var, var_dim = var_bdim
-        accum, accum_dim = accum_bdim
-        accum_update, accum_update_dim = accum_update_bdim
-        lr, lr_dim = lr_bdim
-        rho, rho_dim = rho_bdim
-        epsilon, epsilon_dim = epsilon_bdim
-        grad, grad_dim = grad_bdim
+        inputs, dims = zip(*(var_bdim, accum_bdim, accum_update_bdim, lr_bdim, rho_bdim, epsilon_bdim, grad_bdim))
+        var, accum, accum_update, lr, rho, epsilon, grad = inputs
+        var_dim, accum_dim, accum_update_dim, lr_dim, rho_dim, epsilon_dim, grad_dim = dims
 
         if var_dim is None:
-            if any(dim is not None for dim in [accum, accum_dim, lr_dim, rho_dim, epsilon_dim, grad_dim]):
-                ValueError("The source axis of `var` is None, but the source "
-                           "axis of `accum/accum_dim/lr/rho/epsilon/grad` is not None. The execution order of "
-                           "operator `{}` cannot be guaranteed.".format(prim_name))
+            if any(dim is not None for dim in dims[1:]):
+                raise ValueError("The source axis of `var` is None, but the source "
+                                 "axis of `accum/accum_dim/lr/rho/epsilon/grad` is not None. The execution order of "
+                                 "operator `{}` cannot be guaranteed.".format(prim_name))
             var, accum, accum_update = prim(var, accum, accum_update, lr, rho, epsilon, grad, u_monad)
             return (var, None), (accum, None), (accum_update, None)
         if var_dim != 0 or accum_dim != var_dim or accum_update_dim != var_dim:
-            ValueError(
-                "For `{}`, the source axis of `var` must be equal to `accum` and `accum_update`, and not equal to 0, "
+            raise ValueError(
+                "For `{}`, the source axis of `var/accum/accum_update` must be 0, "
                 "but got the source axis of `var`: {}, `accum`: {}, `accum_update`: {}.".format(
                     prim_name, var_dim, accum_dim, accum_update_dim))
 
@@ -129,8 +200,7 @@ def get_apply_ftrl_rule(prim, axis_size):
     else:
         batch_rank = 1
     prim_name = prim.name
-    batch_prim = _vmap_clone_prim(prim)
-    batch_prim.add_prim_attr('batch_rank', batch_rank)
+    batch_prim = _vmap_get_batch_prim(prim, batch_rank)
 
     def vmap_rule(var_bdim, accum_bdim, linear_bdim, grad_bdim, lr_bdim, l1_bdim, l2_bdim, lr_power_bdim, u_monad):
         var, var_dim = var_bdim
@@ -144,15 +214,15 @@ def get_apply_ftrl_rule(prim, axis_size):
 
         if var_dim is None:
             if any(dim is not None for dim in [accum_dim, linear_dim, grad_dim, lr_dim, l1_dim, l2_dim, lr_power_dim]):
-                ValueError("The source axis of `var` is None, "
-                           "but the source axis of `accum/linear/grad/lr/l1/l1/lr_power` is not None. "
-                           "The execution order of operator `{}` cannot be guaranteed.".format(prim_name))
+                raise ValueError("The source axis of `var` is None, "
+                                 "but the source axis of `accum/linear/grad/lr/l1/l1/lr_power` is not None. "
+                                 "The execution order of operator `{}` cannot be guaranteed.".format(prim_name))
             var = prim(var, accum, linear, grad, lr, l1, l2, lr_power, u_monad)
             return (var, None)
         if var_dim != 0 or accum_dim != var_dim or linear_dim != var_dim:
-            ValueError("For `{}`, the source axis of `var/accum/linear` must be 0, "
-                       "but get `var`: {}, `accum`: {}, `linear`: {}.".format(prim_name, var_dim, accum_dim,
-                                                                              linear_dim))
+            raise ValueError("For `{}`, the source axis of `var/accum/linear` must be 0, "
+                             "but get `var`: {}, `accum`: {}, `linear`: {}.".format(prim_name, var_dim, accum_dim,
+                                                                                    linear_dim))
         grad = _bdim_at_front(grad, grad_dim, axis_size)
         lr = _bdim_at_front(lr, lr_dim, axis_size)
         l1 = _bdim_at_front(l1, l1_dim, axis_size)
@@ -174,8 +244,7 @@ def get_apply_proximal_adagrad_rule(prim, axis_size):
         batch_rank = 1
 
     prim_name = prim.name
-    batch_prim = _vmap_clone_prim(prim)
-    batch_prim.add_prim_attr('batch_rank', batch_rank)
+    batch_prim = _vmap_get_batch_prim(prim, batch_rank)
 
     def vmap_rule(var_bdim, accum_bdim, lr_bdim, l1_bdim, l2_bdim, grad_bdim, u_monad):
         var, var_dim = var_bdim
@@ -187,14 +256,14 @@ def get_apply_proximal_adagrad_rule(prim, axis_size):
 
         if var_dim is None:
             if any(dim is not None for dim in [accum_dim, lr_dim, l1_dim, l2_dim, grad_dim]):
-                ValueError("The source axis of `var` is None, but the source "
-                           "axis of `accum/lr/l1/l2/grad` is not None. The execution order of "
-                           "operator `{}` cannot be guaranteed.".format(prim_name))
+                raise ValueError("The source axis of `var` is None, but the source "
+                                 "axis of `accum/lr/l1/l2/grad` is not None. The execution order of "
+                                 "operator `{}` cannot be guaranteed.".format(prim_name))
             var, accum = prim(var, accum, lr, l1, l2, grad, u_monad)
             return (var, None), (accum, None)
 
         if var_dim != 0 or accum_dim != var_dim:
-            raise ValueError("For `{}`, the source axis of `var` must be equal to `accum`, and not equal to 0, "
+            raise ValueError("For `{}`, the source axis of `var/accum` must be 0, "
                              "but got the source axis of `var`: {}, `accum`: {}.".format(prim_name, var_dim, accum_dim))
 
         lr = _bdim_at_front(lr, lr_dim, axis_size)
@@ -217,8 +286,7 @@ def get_apply_proximal_gradient_descent_rule(prim, axis_size):
         batch_rank = 1
 
     prim_name = prim.name
-    batch_prim = _vmap_clone_prim(prim)
-    batch_prim.add_prim_attr('batch_rank', batch_rank)
+    batch_prim = _vmap_get_batch_prim(prim, batch_rank)
 
     def vmap_rule(var_bdim, alpha_bdim, l1_bdim, l2_bdim, delta_bdim, u_monad):
         var, var_dim = var_bdim
@@ -229,14 +297,14 @@ def get_apply_proximal_gradient_descent_rule(prim, axis_size):
 
         if var_dim is None:
             if any(dim is not None for dim in [alpha_dim, l1_dim, l2_dim, delta_dim]):
-                ValueError("The source axis of `var` is None, but the source "
-                           "axis of `alpha/l1/l2/delta` is not None. The execution order of "
-                           "operator `{}` cannot be guaranteed.".format(prim_name))
+                raise ValueError("The source axis of `var` is None, but the source "
+                                 "axis of `alpha/l1/l2/delta` is not None. The execution order of "
+                                 "operator `{}` cannot be guaranteed.".format(prim_name))
             var = prim(var, alpha, l1, l2, delta, u_monad)
             return (var, None)
 
         if var_dim != 0:
-            raise ValueError("For `{}`, the source axis of `var` must not equal to 0, "
+            raise ValueError("For `{}`, the source axis of `var` must be 0, "
                              "but got the source axis of `var`: {}.".format(prim_name, var_dim))
 
         alpha = _bdim_at_front(alpha, alpha_dim, axis_size)
@@ -260,11 +328,22 @@ def get_bce_with_logits_loss_vamp_rule(prim, axis_size):
     else:
         prim_reduction = prim.reduction
     prim_name = prim.name
-    bce_logits_with_loss_op = NN.BCEWithLogitsLoss('none')
     if prim_reduction == 'mean':
-        reduce_op = P.ReduceMean()
+        reduce_op = _reduce_mean
     elif prim_reduction == "sum":
-        reduce_op = P.ReduceSum()
+        reduce_op = _reduce_sum
+
+    if prim_reduction == 'none':
+        def compute_out(logits, label, weight, pos_weight, reduce_indexes):
+            return prim(logits, label, weight, pos_weight)
+    elif prim_reduction in ('mean', 'sum'):
+        def compute_out(logits, label, weight, pos_weight, reduce_indexes):
+            out = _bce_with_logits_loss_none(logits, label, weight, pos_weight)
+            return reduce_op(out, reduce_indexes)
+    else:
+        raise RuntimeError("For {} vmap, the attribute of reduction must in "
+                           "('none', 'mean', 'sum'), but got {}."
+                           .format(prim_name, prim_reduction))
 
     def vmap_rule(logits_bdim, label_bdim, weight_bdim, pos_weight_bdim):
         is_all_none, result = vmap_general_preprocess(prim, logits_bdim, label_bdim,
@@ -285,19 +364,11 @@ def get_bce_with_logits_loss_vamp_rule(prim, axis_size):
         reduce_indexes = None
         # If rank is larger than 1, we need to reduce result when reduction != 'none'
         if max_rank > 1:
-            reduce_indexes = tuple(range(1, max_rank))
+            reduce_indexes = _get_reduce_indexes(max_rank)
         if logits_dim == label_dim and F.shape(logits) == F.shape(label) \
                 and logits_dim == weight_dim and F.shape(logits) == F.shape(weight) \
                 and logits_dim == pos_weight_dim and F.shape(logits) == F.shape(pos_weight):
-            if prim_reduction == 'none':
-                output = prim(logits, label, weight, pos_weight)
-            elif prim_reduction in ('mean', 'sum'):
-                out = bce_logits_with_loss_op(logits, label, weight, pos_weight)
-                output = reduce_op(out, reduce_indexes)
-            else:
-                raise RuntimeError("For {} vmap, the attribute of reduction must in "
-                                   "('none', 'mean', 'sum'), but got {}."
-                                   .format(prim_name, prim_reduction))
+            output = compute_out(logits, label, weight, pos_weight, reduce_indexes)
             return output, logits_dim
 
         logits = _bdim_at_front(logits, logits_dim, axis_size)
@@ -307,17 +378,9 @@ def get_bce_with_logits_loss_vamp_rule(prim, axis_size):
         logits_shape = F.shape(logits)
         weight_shape = F.shape(weight)
         pos_weight_shape = F.shape(pos_weight)
-        weight = _handle_broadcasting(weight, weight_shape, logits_shape)
-        pos_weight = _handle_broadcasting(pos_weight, pos_weight_shape, logits_shape)
-        if prim_reduction == 'none':
-            output = prim(logits, label, weight, pos_weight)
-        elif prim_reduction in ('mean', 'sum'):
-            out = bce_logits_with_loss_op(logits, label, weight, pos_weight)
-            output = reduce_op(out, reduce_indexes)
-        else:
-            raise RuntimeError("For {} vmap, the attribute of reduction must in "
-                               "('none', 'mean', 'sum'), but got {}."
-                               .format(prim_name, prim_reduction))
+        weight, pos_weight = _handle_broadcasting_many((weight, pos_weight), (weight_shape, pos_weight_shape),
+                                                       logits_shape)
+        output = compute_out(logits, label, weight, pos_weight, reduce_indexes)
         return output, 0
 
     return vmap_rule
@@ -673,9 +736,14 @@ def get_adaptive_max_pool3d_vmap_rule(prim, axis_size):
         shape = (-1,) + x_shape[dhw_reverse_index:]
         x = F.reshape(x, shape)
         out, indices = prim(x, out_size)
-        # AdaptiveMaxPool3D is a dynamic op, the 'shape' of reshape should be a tensor
-        front_shape = convert_shape_to_tensor(x_shape[:dhw_reverse_index])
-        output_shape = F.concat((front_shape, out_size))
+        out_shape = F.shape(out)
+        if is_shape_known(out_shape):
+            # `output_size` is a constant, so the output shape can be inferred statically.
+            output_shape = x_shape[:dhw_reverse_index] + out_shape[dhw_reverse_index:]
+        else:
+            # AdaptiveMaxPool3D is a dynamic op, the 'shape' of reshape should be a tensor
+            front_shape = convert_shape_to_tensor(x_shape[:dhw_reverse_index])
+            output_shape = F.concat((front_shape, out_size))
         out = F.reshape(out, output_shape)
         indices = F.reshape(indices, output_shape)
         return (out, 0), (indices, 0)
@@ -691,15 +759,30 @@ def get_kl_div_loss_vmap_rule(prim, axis_size):
 
     prim_reduction = prim.reduction
     if prim_reduction == "mean":
-        kl_div_loss_op = P.KLDivLoss("none")
-        reduce_op = P.ReduceMean()
-    elif prim_reduction == "sum":
-        kl_div_loss_op = P.KLDivLoss("none")
-        reduce_op = P.ReduceSum()
+        reduce_op = _reduce_mean
+    elif prim_reduction in ("sum", "batchmean"):
+        reduce_op = _reduce_sum
+
+    # elementwise style when reduction='none', otherwise reduce style
+    if prim_reduction == "none":
+        def compute_out(x, target, reduce_indexes, factor):
+            return prim(x, target)
+    elif prim_reduction in ("mean", "sum"):
+        def compute_out(x, target, reduce_indexes, factor):
+            out = _kl_div_loss_none(x, target)
+            if reduce_indexes is not None:
+                out = reduce_op(out, reduce_indexes)
+            return out
     elif prim_reduction == "batchmean":
-        kl_div_loss_op = P.KLDivLoss("none")
-        reduce_op = P.ReduceSum()
-        factor_op = P.Div()
+        def compute_out(x, target, reduce_indexes, factor):
+            out = _kl_div_loss_none(x, target)
+            if reduce_indexes is not None:
+                out = reduce_op(out, reduce_indexes)
+                out = _div(out, factor)
+            return out
+    else:
+        raise RuntimeError("For KLDivLoss vmap, reduction should be one of "
+                           "['none', 'mean', 'batchmean', 'sum'], but got '{}'".format(prim_reduction))
 
     def vmap_rule(x_bdim, target_bdim):
         is_all_none, result = vmap_general_preprocess(prim, x_bdim, target_bdim)
@@ -717,24 +800,10 @@ def get_kl_div_loss_vmap_rule(prim, axis_size):
         factor = 1
         # if rank is larger than 1, we need to reduce result when reduction != 'none'
         if max_rank > 1:
-            reduce_indexes = tuple(range(1, max_rank))
+            reduce_indexes = _get_reduce_indexes(max_rank)
             factor = F.shape(x)[1]
 
-        # elementwise style when reduction='none', otherwise reduce style
-        if prim_reduction == "none":
-            out = prim(x, target)
-        elif prim_reduction in ("mean", "sum"):
-            out = kl_div_loss_op(x, target)
-            if reduce_indexes is not None:
-                out = reduce_op(out, reduce_indexes)
-        elif prim_reduction == "batchmean":
-            out = kl_div_loss_op(x, target)
-            if reduce_indexes is not None:
-                out = reduce_op(out, reduce_indexes)
-                out = factor_op(out, factor)
-        else:
-            raise RuntimeError("For KLDivLoss vmap, reduction should be one of "
-                               "['none', 'mean', 'batchmean', 'sum'], but got '{}'".format(prim_reduction))
+        out = compute_out(x, target, reduce_indexes, factor)
         return (out, 0)
 
     return vmap_rule
@@ -749,7 +818,7 @@ def get_kl_div_loss_grad_vmap_rule(prim, axis_size):
     else:
         reduction = prim.reduction
 
-    kldivloss_grad = G.KLDivLossGrad(reduction=reduction)
+    kldivloss_grad = _get_kl_div_loss_grad(reduction)
 
     def vmap_rule(dy_bdim, x_bdim, target_bdim):
         is_all_none, result = vmap_general_preprocess(prim, dy_bdim, x_bdim, target_bdim)
@@ -780,11 +849,25 @@ def get_smooth_l1_loss_vmap_rule(prim, axis_size):
         prim_reduction = prim.reduction
         prim_beta = prim.beta
 
-    smooth_l1_loss_op = P.SmoothL1Loss(prim_beta, 'none')
+    smooth_l1_loss_op = _get_smooth_l1_loss_none(prim_beta)
     if prim_reduction == 'mean':
-        reduce_op = P.ReduceMean()
+        reduce_op = _reduce_mean
     elif prim_reduction == "sum":
-        reduce_op = P.ReduceSum()
+        reduce_op = _reduce_sum
+
+    # elementwise style when reduction='none', otherwise reduce style
+    if prim_reduction == "none":
+        def compute_out(x, target, reduce_indexes):
+            return prim(x, target)
+    elif prim_reduction in ("mean", "sum"):
+        def compute_out(x, target, reduce_indexes):
+            out = smooth_l1_loss_op(x, target)
+            if reduce_indexes is not None:
+                out = reduce_op(out, reduce_indexes)
+            return out
+    else:
+        raise RuntimeError("For SmoothL1Loss vmap, reduction should be one of "
+                           "['none', 'mean', 'sum'], but got '{}'".format(prim_reduction))
 
     def vmap_rule(x_bdim, target_bdim):
         is_all_none, result = vmap_general_preprocess(
@@ -802,18 +885,9 @@ def get_smooth_l1_loss_vmap_rule(prim, axis_size):
         reduce_indexes = None
         # if rank is larger than 1, we need to reduce result when reduction != 'none'
         if max_rank > 1:
-            reduce_indexes = tuple(range(1, max_rank))
+            reduce_indexes = _get_reduce_indexes(max_rank)
 
-        # elementwise style when reduction='none', otherwise reduce style
-        if prim_reduction == "none":
-            out = prim(x, target)
-        elif prim_reduction in ("mean", "sum"):
-            out = smooth_l1_loss_op(x, target)
-            if reduce_indexes is not None:
-                out = reduce_op(out, reduce_indexes)
-        else:
-            raise RuntimeError("For SmoothL1Loss vmap, reduction should be one of "
-                               "['none', 'mean', 'sum'], but got '{}'".format(prim_reduction))
+        out = compute_out(x, target, reduce_indexes)
         return (out, 0)
 
     return vmap_rule
@@ -829,7 +903,7 @@ def get_smooth_l1_loss_grad_vmap_rule(prim, axis_size):
     else:
         reduction = prim.reduction
         beta = prim.beta
-    smooth_l1_loss_grad = G.SmoothL1LossGrad(beta, reduction)
+    smooth_l1_loss_grad = _get_smooth_l1_loss_grad(beta, reduction)
 
     def vmap_rule(dy_bdim, x_bdim, target_bdim):
         is_all_none, result = vmap_general_preprocess(
@@ -858,16 +932,20 @@ def get_log_softmax_vmap_rule(prim, axis_size):
     else:
         axis = prim.axis
 
+    # A non-negative axis does not depend on the rank of the input, so the rank query can be skipped.
+    if axis >= 0:
+        def get_batch_axis(x, x_dim):
+            return _get_log_softmax_batch_axis(axis, x_dim)
+    else:
+        def get_batch_axis(x, x_dim):
+            return _get_log_softmax_batch_axis(axis + F.rank(x) - 1, x_dim)
+
     def vmap_rule(x_bdim):
         is_all_none, result = vmap_general_preprocess(prim, x_bdim)
         if is_all_none:
             return result
         x, x_dim = x_bdim
-        x_ndim = F.rank(x) - 1
-
-        batch_axis = axis + x_ndim if axis < 0 else axis
-        batch_axis = batch_axis if batch_axis < x_dim else batch_axis + 1
-
+        batch_axis = get_batch_axis(x, x_dim)
         out = F.log_softmax(x, batch_axis)
         return out, x_dim
 
@@ -889,8 +967,8 @@ def get_random_categorical_vmap_rule(prim, axis_size):
         seed, seed_dim = seed_bdim
         if num_sample_dim is not None or seed_dim is not None:
             raise RuntimeError("For RandomCategorical vmap, num_sample and seed should be None.")
-        # Move axis to first dim
-        logits = _bdim_at_front(logits, logits_dim, axis_size)
+        # Move axis to first dim, the common case of a batch of 2-D logits at axis 0 calls `prim` directly.
+        logits = _maybe_bdim_at_front(logits, logits_dim, axis_size)
         x_ndim = F.rank(logits)
         if x_ndim > default_dim:
             x_ori_shape = F.shape(logits)
@@ -921,9 +999,8 @@ def get_lrn_vmap_rule(prim, axis_size):
         x_ndim = F.rank(x)
         if x_ndim > lrn_default_dim:
             x_ori_shape = F.shape(x)
-            x = F.reshape(x, x_ori_shape[:lrn_pre_remain_dim] + (-1,))
-            out = prim(x)
-            out = F.reshape(out, x_ori_shape)
+            out = _reshape_call_reshape(prim, (x,), _get_trailing_collapsed_shape(x_ori_shape, lrn_pre_remain_dim),
+                                        lambda _: x_ori_shape)
         else:
             out = prim(x)
         return out, x_ndim - 1
@@ -938,6 +1015,20 @@ def get_pad_v3_vmap_rule(prim, axis_size):
     input_max_dim = 4
     mode = prim.mode
 
+    if mode == "constant":
+        def get_pad_args(paddings, params_bdim):
+            if len(params_bdim) != 3:
+                _raise_value_error("The input params in `{}` of constant mode must be 3, "
+                                   "but got {}.".format(prim.name, len(params_bdim)))
+            values, values_dim = params_bdim[2]
+            if values_dim is not None:
+                _raise_value_error("The source axis of `values_dim` in `{}` must be None, "
+                                   "but got {}.".format(prim.name, values_dim))
+            return (paddings, values)
+    else:
+        def get_pad_args(paddings, params_bdim):
+            return (paddings,)
+
     def vmap_rule(*params_bdim):
         is_all_none, result = vmap_general_preprocess(
             prim, params_bdim)
@@ -948,44 +1039,28 @@ def get_pad_v3_vmap_rule(prim, axis_size):
                                "but got {}.".format(prim.name, len(params_bdim)))
         input_x, input_x_dim = params_bdim[0]
         paddings, paddings_dim = params_bdim[1]
-        values = None
         out = None
         x = _bdim_at_front(input_x, input_x_dim, axis_size)
         if paddings_dim is not None:
             _raise_value_error("The source axis of `paddings` in `{}` must be None, "
                                "but got {}.".format(prim.name, paddings_dim))
-        if mode == "constant":
-            if len(params_bdim) != 3:
-                _raise_value_error("The input params in `{}` of constant mode must be 3, "
-                                   "but got {}.".format(prim.name, len(params_bdim)))
-            values, values_dim = params_bdim[2]
-            if values_dim is not None:
-                _raise_value_error("The source axis of `values_dim` in `{}` must be None, "
-                                   "but got {}.".format(prim.name, values_dim))
-        pad_dim = F.shape(paddings)[0] / pad_pair
-        x_ndim = F.rank(x)
+        pad_args = get_pad_args(paddings, params_bdim)
+        pad_dim = F.shape(paddings)[0] // pad_pair
+        x_shape = F.shape(x)
+        x_ndim = len(x_shape)
         # pylint: disable=chained-comparison
         if pad_dim < x_ndim and x_ndim < input_max_dim:
-            if mode == "constant":
-                out = prim(x, paddings, values)
-            else:
-                out = prim(x, paddings)
+            out = prim(x, *pad_args)
         elif x_ndim > input_max_dim:
             # reshape to 4 dims
-            x_shape = F.shape(x)
             diff_dim = x_ndim - input_max_dim
-            first_shape = 1
-            for i in range(diff_dim + 1):
-                first_shape *= x_shape[i]
+            first_shape = F.shape_mul(x_shape[:diff_dim + 1])
             input_shape = (first_shape,) + x_shape[(-input_max_dim + 1):]
-            x = F.reshape(x, input_shape)
-            if mode == "constant":
-                out = prim(x, paddings, values)
-            else:
-                out = prim(x, paddings)
-            out_shape = F.shape(out)
-            real_out_shape = x_shape[:diff_dim + 1] + out_shape[1:]
-            out = F.reshape(out, real_out_shape)
+
+            def get_real_out_shape(out):
+                return x_shape[:diff_dim + 1] + F.shape(out)[1:]
+
+            out = _reshape_call_reshape(prim, (x,), input_shape, get_real_out_shape, *pad_args)
         else:
             _raise_value_error("The dim of `input_x` in `{}` must be bigger than {}, "
                                "but got {}.".format(prim.name, pad_dim, x_ndim))
@@ -1013,14 +1088,10 @@ def get_lrn_grad_vmap_rule(prim, axis_size):
         y = _bdim_at_back(y, y_dim, axis_size)
         x_ndim = F.rank(x)
         if x_ndim > lrn_default_dim:
+            # `dy`, `x` and `y` of LRNGrad always share the same shape.
             x_ori_shape = F.shape(x)
-            dy_ori_shape = F.shape(dy)
-            y_ori_shape = F.shape(y)
-            x = F.reshape(x, x_ori_shape[:lrn_pre_remain_dim] + (-1,))
-            dy = F.reshape(dy, dy_ori_shape[:lrn_pre_remain_dim] + (-1,))
-            y = F.reshape(y, y_ori_shape[:lrn_pre_remain_dim] + (-1,))
-            dx = prim(dy, x, y)
-            dx = F.reshape(dx, x_ori_shape)
+            dx = _reshape_call_reshape(prim, (dy, x, y), _get_trailing_collapsed_shape(x_ori_shape, lrn_pre_remain_dim),
+                                       lambda _: x_ori_shape)
         else:
             dx = prim(dy, x, y)
         return dx, x_ndim - 1
@@ -1036,8 +1107,7 @@ def get_apply_adam_with_amsgrad_rule(prim, axis_size):
     else:
         batch_rank = 1
     prim_name = prim.name
-    batch_prim = _vmap_clone_prim(prim)
-    batch_prim.add_prim_attr("batch_rank", batch_rank)
+    batch_prim = _vmap_get_batch_prim(prim, batch_rank)
 
     def vmap_rule(var_bdim, m_bdim, v_bdim, vhat_bdim, beta1_power_bdim, beta2_power_bdim, lr_bdim, grad_bdim, u_monad):
         var, var_dim = var_bdim
@@ -1050,23 +1120,23 @@ def get_apply_adam_with_amsgrad_rule(prim, axis_size):
         grad, grad_dim = grad_bdim
 
         if var_dim is None:
-            if any(dim is not None for dim in [m_dim, v_dim, vhat_dim, beta1_power_dim,
-                                               beta2_power_dim, lr_dim, grad_dim]):
-                ValueError("The source axis of `var` is None, "
-                           "but the source axis of `m/v/vhat/beta1_power/beta2_power/lr/grad` is not None. "
-                           "The execution of operator `{}` cannot be guaranteed.".format(prim_name))
+            if m_dim is not None or v_dim is not None or vhat_dim is not None or beta1_power_dim is not None \
+                    or beta2_power_dim is not None or lr_dim is not None or grad_dim is not None:
+                raise ValueError("The source axis of `var` is None, "
+                                 "but the source axis of `m/v/vhat/beta1_power/beta2_power/lr/grad` is not None. "
+                                 "The execution of operator `{}` cannot be guaranteed.".format(prim_name))
             out_var, out_m, out_v, out_vhat = prim(var, m, v, vhat, beta1_power, beta2_power, lr, grad, u_monad)
             return ((out_var, None), (out_m, None), (out_v, None), (out_vhat, None))
 
-        if any(dim != 0 for dim in [var_dim, m_dim, v_dim, vhat_dim]):
-            ValueError("For `{}`, the source axis of `var/m/v/vhat` must be 0, "
-                       "but get `var`: {}, `m`: {}, `v`: {}, `vhat`: {}".format(prim_name, var_dim,
-                                                                                m_dim, v_dim, vhat_dim))
+        if var_dim != 0 or m_dim != 0 or v_dim != 0 or vhat_dim != 0:
+            raise ValueError("For `{}`, the source axis of `var/m/v/vhat` must be 0, "
+                             "but get `var`: {}, `m`: {}, `v`: {}, `vhat`: {}".format(prim_name, var_dim,
+                                                                                      m_dim, v_dim, vhat_dim))
 
-        beta1_power = _bdim_at_front(beta1_power, beta1_power_dim, axis_size)
-        beta2_power = _bdim_at_front(beta2_power, beta2_power_dim, axis_size)
-        lr = _bdim_at_front(lr, lr_dim, axis_size)
-        grad = _bdim_at_front(grad, grad_dim, axis_size)
+        beta1_power = _maybe_bdim_at_front(beta1_power, beta1_power_dim, axis_size)
+        beta2_power = _maybe_bdim_at_front(beta2_power, beta2_power_dim, axis_size)
+        lr = _maybe_bdim_at_front(lr, lr_dim, axis_size)
+        grad = _maybe_bdim_at_front(grad, grad_dim, axis_size)
 
         out_var, out_m, out_v, out_vhat = batch_prim(var, m, v, vhat, beta1_power, beta2_power, lr, grad, u_monad)
         return ((out_var, 0), (out_m, 0), (out_v, 0), (out_vhat, 0))
@@ -1083,8 +1153,7 @@ def get_apply_power_sign_rule(prim, axis_size):
         batch_rank = 1
 
     prim_name = prim.name
-    batch_prim = _vmap_clone_prim(prim)
-    batch_prim.add_prim_attr("batch_rank", batch_rank)
+    batch_prim = _vmap_get_batch_prim(prim, batch_rank)
 
     def vmap_rule(var_bdim, m_bdim, lr_bdim, logbase_bdim, sign_decay_bdim, beta_bdim, grad_bdim, u_monad):
         var, var_dim = var_bdim
@@ -1096,7 +1165,8 @@ def get_apply_power_sign_rule(prim, axis_size):
         grad, grad_dim = grad_bdim
 
         if var_dim is None:
-            if any(dim is not None for dim in [m_bdim, lr_bdim, logbase_bdim, sign_decay_bdim, beta_bdim, grad_bdim]):
+            if m_dim is not None or lr_dim is not None or logbase_dim is not None or sign_decay_dim is not None \
+                    or beta_dim is not None or grad_dim is not None:
                 raise ValueError("The source axis of `var` is None, but the source "
                                  "axis of `m/lr/logbase/sign_decay/beta/grad` is not None. The execution order of "
                                  "operator `{}` cannot be guaranteed.".format(prim_name))
@@ -1106,11 +1176,11 @@ def get_apply_power_sign_rule(prim, axis_size):
             raise ValueError("For `{}`, the source axis of `var` must be equal to `m`, and not equal to 0, "
                              "but got the source axis of `var`: {}, `m`: {}.".format(prim_name, var_dim, m_dim))
 
-        lr = _bdim_at_front(lr, lr_dim, axis_size)
-        logbase = _bdim_at_front(logbase, logbase_dim, axis_size)
-        sign_decay = _bdim_at_front(sign_decay, sign_decay_dim, axis_size)
-        beta = _bdim_at_front(beta, beta_dim, axis_size)
-        grad = _bdim_at_front(grad, grad_dim, axis_size)
+        lr = _maybe_bdim_at_front(lr, lr_dim, axis_size)
+        logbase = _maybe_bdim_at_front(logbase, logbase_dim, axis_size)
+        sign_decay = _maybe_bdim_at_front(sign_decay, sign_decay_dim, axis_size)
+        beta = _maybe_bdim_at_front(beta, beta_dim, axis_size)
+        grad = _maybe_bdim_at_front(grad, grad_dim, axis_size)
         var, m = batch_prim(var, m, lr, logbase, sign_decay, beta, grad, u_monad)
         return (var, 0), (m, 0)
 
@@ -1125,9 +1195,7 @@ def get_apply_adagrad_da_vmap_rule(prim, axis_size):
     else:
         batch_rank = 1
 
-    attr = prim.init_attrs
-    batch_prim = P.ApplyAdagradDA(**attr)
-    batch_prim.add_prim_attr('batch_rank', batch_rank)
+    batch_prim = _vmap_get_batch_prim(prim, batch_rank)
     prim_name = prim.name
 
     def vmap_rule(var_bdim, gradient_accumulator_bdim, gradient_squared_accumulator_bdim, grad_bdim, lr_bdim, l1_bdim,
@@ -1142,9 +1210,9 @@ def get_apply_adagrad_da_vmap_rule(prim, axis_size):
         global_step, global_step_dim = global_step_bdim
 
         if var_dim is None:
-            if any(dim is not None for dim in
-                   [gradient_accumulator_bdim, gradient_squared_accumulator_bdim, grad_bdim, lr_bdim, l1_bdim, l2_bdim,
-                    global_step_bdim]):
+            if gradient_accumulator_dim is not None or gradient_squared_accumulator_dim is not None \
+                    or grad_dim is not None or lr_dim is not None or l1_dim is not None or l2_dim is not None \
+                    or global_step_dim is not None:
                 raise ValueError("The source axis of 'var' is None, but the source "
                                  "axis of 'gradient_accumulator/gradient_squared_accumulator/grad/lr/l1/l2/global_step'"
                                  " is not None. The execution order of "
@@ -1163,11 +1231,11 @@ def get_apply_adagrad_da_vmap_rule(prim, axis_size):
                 f"'gradient_accumulator_dim': {gradient_accumulator_dim}, "
                 f"'gradient_squared_accumulator_dim': {gradient_squared_accumulator_dim}")
 
-        grad = _bdim_at_front(grad, grad_dim, axis_size)
-        lr = _bdim_at_front(lr, lr_dim, axis_size)
-        l1 = _bdim_at_front(l1, l1_dim, axis_size)
-        l2 = _bdim_at_front(l2, l2_dim, axis_size)
-        global_step = _bdim_at_front(global_step, global_step_dim, axis_size)
+        grad = _maybe_bdim_at_front(grad, grad_dim, axis_size)
+        lr = _maybe_bdim_at_front(lr, lr_dim, axis_size)
+        l1 = _maybe_bdim_at_front(l1, l1_dim, axis_size)
+        l2 = _maybe_bdim_at_front(l2, l2_dim, axis_size)
+        global_step = _maybe_bdim_at_front(global_step, global_step_dim, axis_size)
 
         var, gradient_accumulator, gradient_squared_accumulator = batch_prim(var, gradient_accumulator,
                                                                              gradient_squared_accumulator, grad, lr, l1,
@@ -1184,30 +1252,7 @@ def get_adaptive_max_pool_2d_vmap_rule(prim, axis_size):
     """VmapRule for `AdaptiveMaxPool2D`."""
     nchw_index = 4
     chw_reverse_index = -3
-    hw_size = 2
     return_indices = prim.return_indices
-    output_size = prim.output_size
-
-    @constexpr
-    def get_output_shape(x_ori_shape, output_size):
-        if isinstance(output_size, tuple):
-            h_out, w_out = output_size
-        else:
-            h_out = output_size
-            w_out = output_size
-
-        rank = len(x_ori_shape)
-        output_shape = x_ori_shape[:rank - hw_size]
-        if h_out is None or h_out == -1:
-            output_shape += (x_ori_shape[-2],)
-        else:
-            output_shape += (h_out,)
-
-        if w_out is None or w_out == -1:
-            output_shape += (x_ori_shape[-1],)
-        else:
-            output_shape += (w_out,)
-        return output_shape
 
     def vmap_rule(input_x_bdim):
         is_all_none, result = vmap_general_preprocess(prim, input_x_bdim)
@@ -1221,15 +1266,12 @@ def get_adaptive_max_pool_2d_vmap_rule(prim, axis_size):
         if x_ndim > nchw_index:
             # for the case of NCHW
             x_ori_shape = F.shape(x)
-            x = F.reshape(x, (-1,) + x_ori_shape[chw_reverse_index:])
-            output_shape = get_output_shape(x_ori_shape, output_size)
+            out = _reshape_call_reshape(
+                prim, (x,), _get_leading_collapsed_shape(x_ori_shape, chw_reverse_index),
+                lambda out: x_ori_shape[:chw_reverse_index] + F.shape(out)[chw_reverse_index:])
             if return_indices:
-                out, indices = prim(x)
-                out = F.reshape(out, output_shape)
-                indices = F.reshape(indices, output_shape)
+                out, indices = out
                 return (out, 0), (indices, 0)
-            out = prim(x)
-            out = F.reshape(out, output_shape)
             return (out, 0)
         # for the case of CHW
         if return_indices:
@@ -1244,6 +1286,7 @@ def get_adaptive_max_pool_2d_vmap_rule(prim, axis_size):
 @vmap_rules_getters.register(NN.MaxPool3DWithArgmax)
 def get_max_pool3d_with_argmax_vmap_rule(prim, axis_size):
     """VmapRule for `MaxPool3DWithArgmax`."""
+    ncdhw_size = 5
     cdhw_reverse_index = -4
 
     def vmap_rule(x_bdim):
@@ -1254,33 +1297,25 @@ def get_max_pool3d_with_argmax_vmap_rule(prim, axis_size):
         x, x_dim = x_bdim
         x = _bdim_at_front(x, x_dim, axis_size)
         x_shape = F.shape(x)
-        input_shape = (-1,) + x_shape[cdhw_reverse_index:]
-        x = F.reshape(x, input_shape)
-        out, indices = prim(x)
-        out_shape = F.shape(out)
-        return_shape = x_shape[:cdhw_reverse_index] + out_shape[cdhw_reverse_index:]
-        out = F.reshape(out, return_shape)
-        indices = F.reshape(indices, return_shape)
+        if len(x_shape) == ncdhw_size:
+            # The batched input is already NCDHW, no reshape is needed.
+            out, indices = prim(x)
+            return (out, 0), (indices, 0)
+        input_shape = _get_leading_collapsed_shape(x_shape, cdhw_reverse_index)
+        out, indices = _reshape_call_reshape(
+            prim, (x,), input_shape,
+            lambda out: x_shape[:cdhw_reverse_index] + F.shape(out)[cdhw_reverse_index:])
         return (out, 0), (indices, 0)
 
     return vmap_rule
 
 
 # Unary vmap
-get_unop_vmap_rule = vmap_rules_getters.register(P.Elu)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.ReLU)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.ReLU6)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.CeLU)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.SeLU)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.HSigmoid)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.Softplus)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.Softsign)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.SoftShrink)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.HShrink)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.GeLU)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.FastGeLU)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.HSwish)(get_unop_vmap_rule)
-get_unop_vmap_rule = vmap_rules_getters.register(P.Tanh)(get_unop_vmap_rule)
+_unop_prims = (P.Elu, P.ReLU, P.ReLU6, P.CeLU, P.SeLU, P.HSigmoid, P.Softplus, P.Softsign, P.SoftShrink, P.HShrink,
+               P.GeLU, P.FastGeLU, P.HSwish, P.Tanh)
+for _unop_prim in _unop_prims:
+    vmap_rules_getters.register(_unop_prim)(get_unop_vmap_rule)
 # UnaryGrad vmap
-get_unary_grad_vmap_rule = vmap_rules_getters.register(G.TanhGrad)(get_unary_grad_vmap_rule)
-get_unary_grad_vmap_rule = vmap_rules_getters.register(G.SoftplusGrad)(get_unary_grad_vmap_rule)
+_unary_grad_prims = (G.TanhGrad, G.SoftplusGrad)
+for _unary_grad_prim in _unary_grad_prims:
+    vmap_rules_getters.register(_unary_grad_prim)(get_unary_grad_vmap_rule)
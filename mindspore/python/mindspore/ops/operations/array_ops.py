@@ -18,6 +18,7 @@ import copy
 import functools
 import itertools
 import numbers
+import operator
 from collections import Counter
 
 import numpy as np
@@ -119,11 +120,11 @@ class _ScatterOpDynamic(PrimitiveWithCheck):
 
     def _check_scatter_shape(self, x_shape, indices_shape, updates_shape, prim_name):
         # x_shape cannot be dynamic
-        if np.any(np.array(x_shape) == -1):
+        if -1 in x_shape:
             raise ValueError(f"For '{prim_name}', the 'input_x' does not support dynamic shape, "
                              f"but got the shape of 'input_x' is {x_shape}.")
         # support indices and updates dynamic
-        if np.any(np.array(indices_shape) == -1) or np.any(np.array(updates_shape) == -1):
+        if -1 in indices_shape or -1 in updates_shape:
             pass
         elif indices_shape != [-1] and updates_shape and updates_shape != indices_shape + x_shape[1:]:
             raise ValueError(f"For '{prim_name}', "
@@ -154,7 +155,10 @@ class _ScatterNdOp(_ScatterOp):
     def _check_scatter_shape(self, x_shape, indices_shape, updates_shape, prim_name):
         validator.check('the dimension of x', len(x_shape),
                         'the dimension of indices', indices_shape[-1], Rel.GE)
-        if indices_shape[:-1] + x_shape[indices_shape[-1]:] != updates_shape:
+        # compare both parts of indices_shape[:-1] + x_shape[indices_shape[-1]:] without concatenating them
+        prefix_len = len(indices_shape) - 1
+        if updates_shape[:prefix_len] != indices_shape[:-1] or \
+                updates_shape[prefix_len:] != x_shape[indices_shape[-1]:]:
             raise ValueError(f"For '{prim_name}', updates_shape = "
                              f"indices_shape[:-1] + x_shape[indices_shape[-1]:], but got x_shape: {x_shape}, "
                              f"indices_shape: {indices_shape}, updates_shape: {updates_shape}.")
@@ -296,6 +300,8 @@ class SameTypeShape(PrimitiveWithInfer):
 
     def __call__(self, x, y):
         """run in PyNative mode"""
+        if isinstance(x, Tensor) and isinstance(y, Tensor) and x.dtype == y.dtype and x.shape == y.shape:
+            return x
         validator.check_value_type('x', x, Tensor, self.name)
         validator.check_value_type('y', y, Tensor, self.name)
         validator.check('x dtype', x.dtype, 'y dtype', y.dtype, Rel.EQ, self.name, TypeError)
@@ -304,9 +310,11 @@ class SameTypeShape(PrimitiveWithInfer):
 
     def __infer__(self, x, y):
         validator.check_subclass('x', x['dtype'], mstype.tensor, self.name)
-        validator.check_subclass('y', y['dtype'], mstype.tensor, self.name)
-        validator.check('x dtype', x['dtype'], 'y dtype', y['dtype'], Rel.EQ, self.name, TypeError)
-        validator.check('x shape', x['shape'], 'y shape', y['shape'], Rel.EQ, self.name)
+        # `y` has the same dtype as the checked `x` in the common case, so it only needs checking on mismatch.
+        if x['dtype'] != y['dtype'] or x['shape'] != y['shape']:
+            validator.check_subclass('y', y['dtype'], mstype.tensor, self.name)
+            validator.check('x dtype', x['dtype'], 'y dtype', y['dtype'], Rel.EQ, self.name, TypeError)
+            validator.check('x shape', x['shape'], 'y shape', y['shape'], Rel.EQ, self.name)
         return x
 
 
@@ -342,6 +350,27 @@ class CheckNumerics(Primitive):
         self.init_prim_io_names(inputs=['x'], outputs=['y'])
 
 
+_DTYPE_TO_NPTYPE = {}
+
+
+def _dtype_to_nptype(dtype):
+    """Convert MindSpore dtype to numpy data type, caching the result."""
+    np_type = _DTYPE_TO_NPTYPE.get(dtype)
+    if np_type is None:
+        np_type = mstype.dtype_to_nptype(dtype)
+        _DTYPE_TO_NPTYPE[dtype] = np_type
+    return np_type
+
+
+def _cast_value_range(value, np_dst_type):
+    """Cast the min or max value of Cast's input to `np_dst_type` and return it as a tuple."""
+    if isinstance(value, (int, float, tuple, list)):
+        value = np.array(value)
+    else:
+        value = value.asnumpy()
+    return tuple(np.atleast_1d(value.astype(np_dst_type, copy=False)).tolist())
+
+
 class Cast(PrimitiveWithInfer):
     """
     Returns a tensor with the new specified data type.
@@ -410,11 +439,11 @@ class Cast(PrimitiveWithInfer):
 
         value = None
         if x['value'] is not None:
-            np_dst_type = mstype.dtype_to_nptype(dst_type)
+            np_dst_type = _dtype_to_nptype(dst_type)
             if isinstance(x['value'], (int, float)):
                 value = Tensor(np.array(x['value']).astype(np_dst_type))
             else:
-                value = Tensor(x['value'].asnumpy().astype(np_dst_type))
+                value = Tensor(x['value'].asnumpy().astype(np_dst_type, copy=False))
 
         out = {'shape': x['shape'],
                'dtype': mstype.tensor_type(t['value']),
@@ -423,19 +452,9 @@ class Cast(PrimitiveWithInfer):
             out['min_shape'] = x['min_shape']
             out['max_shape'] = x['max_shape']
         if 'min_value' in x and 'max_value' in x:
-            np_dst_type = mstype.dtype_to_nptype(dst_type)
-            if isinstance(x['min_value'], (int, float, tuple, list)):
-                min_value = Tensor(np.array(x['min_value']).astype(np_dst_type))
-            else:
-                min_value = Tensor(x['min_value'].asnumpy().astype(np_dst_type))
-            min_value = tuple(min_value.asnumpy().tolist())
-            if isinstance(x['max_value'], (int, float, tuple, list)):
-                max_value = Tensor(np.array(x['max_value']).astype(np_dst_type))
-            else:
-                max_value = Tensor(x['max_value'].asnumpy().astype(np_dst_type))
-            max_value = tuple(max_value.asnumpy().tolist())
-            out['min_value'] = min_value
-            out['max_value'] = max_value
+            np_dst_type = _dtype_to_nptype(dst_type)
+            out['min_value'] = _cast_value_range(x['min_value'], np_dst_type)
+            out['max_value'] = _cast_value_range(x['max_value'], np_dst_type)
         return out
 
 
@@ -633,6 +652,12 @@ class Col2Im(Primitive):
         self.add_prim_attr('stride', self.stride)
 
 
+def _trunc_div(x, y):
+    """Integer division rounding toward zero like `int(x / y)`, but without going through a float."""
+    quotient = abs(x) // abs(y)
+    return quotient if (x < 0) == (y < 0) else -quotient
+
+
 class Reshape(PrimitiveWithInfer):
     """
     Rearranges the input Tensor based on the given shape.
@@ -679,7 +704,7 @@ class Reshape(PrimitiveWithInfer):
             max_shape = shape["max_value"]
             if len(min_shape) != shape_rank or len(max_shape) != shape_rank:
                 min_shape = [1] * shape_rank
-                max_shape = [int(np.prod(max_shape))] * shape_rank
+                max_shape = [int(functools.reduce(operator.mul, max_shape, 1))] * shape_rank
             else:
                 for i in range(shape_rank):
                     if min_shape[i] == max_shape[i] and min_shape[i] != 1:
@@ -687,7 +712,7 @@ class Reshape(PrimitiveWithInfer):
         elif is_shape_unknown(x_shp) and "max_shape" in x:
             # when dynamic memory allocation is supported, max_shape can be left out
             min_shape = [1] * shape_rank
-            max_shape = [int(np.prod(x["max_shape"]))] * shape_rank
+            max_shape = [int(functools.reduce(operator.mul, x["max_shape"], 1))] * shape_rank
         return out_shape, min_shape, max_shape
 
     @staticmethod
@@ -699,15 +724,15 @@ class Reshape(PrimitiveWithInfer):
             x_max_shape = x['max_shape']
         if 'min_shape' in x:
             x_min_shape = x['min_shape']
-        max_arr_prod = np.prod(x_max_shape)
-        min_arr_prod = np.prod(x_min_shape)
-        max_shape = list(shape_v)
-        min_shape = list(shape_v)
+        max_arr_prod = functools.reduce(operator.mul, x_max_shape, 1)
+        min_arr_prod = functools.reduce(operator.mul, x_min_shape, 1)
+        max_shape = shape_v
+        min_shape = shape_v
         if neg_index != -1:
-            max_shape[neg_index] = int(max_arr_prod / dim_prod)
-            min_shape[neg_index] = int(min_arr_prod / dim_prod)
-        out['max_shape'] = tuple(max_shape)
-        out['min_shape'] = tuple(min_shape)
+            max_shape = shape_v[:neg_index] + (_trunc_div(max_arr_prod, dim_prod),) + shape_v[neg_index + 1:]
+            min_shape = shape_v[:neg_index] + (_trunc_div(min_arr_prod, dim_prod),) + shape_v[neg_index + 1:]
+        out['max_shape'] = max_shape
+        out['min_shape'] = min_shape
         return out
 
     def _update_shape_and_value(self, out, x, shape_v, dim_prod, neg_index):
@@ -717,15 +742,16 @@ class Reshape(PrimitiveWithInfer):
             raise ValueError(f"For '{self.name}', the shape of 'input_x' is {x_shp}, "
                              f"the value of 'input_shape' is {shape_v}. "
                              f"The product of 'input_shape' should > 0, but got {dim_prod}.")
-        arr_prod = np.prod(x_shp)
+        arr_prod = functools.reduce(operator.mul, x_shp, 1)
         if neg_index != -1:
-            shape_v[neg_index] = int(arr_prod / dim_prod)
-            dim_prod *= shape_v[neg_index]
+            neg_dim = arr_prod // dim_prod
+            shape_v = shape_v[:neg_index] + (neg_dim,) + shape_v[neg_index + 1:]
+            dim_prod *= neg_dim
         if dim_prod != arr_prod:
             raise ValueError(f"For '{self.name}', the product of the 'input_x' shape "
                              f"should be equal to product of 'input_shape', but got product of the"
                              f" shape of 'input_x': {arr_prod}, product of 'input_shape': {dim_prod}.")
-        out['shape'] = tuple(shape_v)
+        out['shape'] = shape_v
 
         if x['value'] is not None:
             out['value'] = Tensor(x['value'].asnumpy().reshape(shape_v))
@@ -755,15 +781,17 @@ class Reshape(PrimitiveWithInfer):
 
         if isinstance(shape_v, Tensor_):
             validator.check_tensor_dtype_valid("shape", shape['dtype'], [mstype.int32, mstype.int64], self.name)
-            shape_v = shape_v.asnumpy().tolist()
+            shape_v = tuple(shape_v.asnumpy().tolist())
         else:
             validator.check_value_type("shape", shape_v, [tuple], self.name)
-            shape_v = list(shape_v)
+
+        if not all(isinstance(shp_i, int) and not isinstance(shp_i, bool) for shp_i in shape_v):
+            for i, shp_i in enumerate(shape_v):
+                validator.check_value_type("shape[%d]" % i, shp_i, [int], self.name)
 
         neg_index = -1
         dim_prod = 1
         for i, shp_i in enumerate(shape_v):
-            validator.check_value_type("shape[%d]" % i, shp_i, [int], self.name)
             if shp_i == -1:
                 if neg_index != -1:
                     raise ValueError(f"For '{self.name}', there can be at most one '-1' in 'input_shape', "
@@ -896,8 +924,9 @@ class Squeeze(Primitive):
         self.init_prim_io_names(inputs=['x'], outputs=['output'])
         validator.check_value_type('axis', axis, [int, tuple], self.name)
         if isinstance(axis, tuple):
-            for idx, item in enumerate(axis):
-                validator.check_value_type("axis[%d]" % idx, item, [int], self.name)
+            if not all(isinstance(item, int) and not isinstance(item, bool) for item in axis):
+                for idx, item in enumerate(axis):
+                    validator.check_value_type("axis[%d]" % idx, item, [int], self.name)
         else:
             self.axis = (axis,)
             self.add_prim_attr("axis", (axis,))
@@ -931,6 +960,13 @@ class Transpose(Primitive):
         """Initialize Transpose"""
         self.init_prim_io_names(inputs=['x', 'perm'], outputs=['output'])
 
+    def check_elim(self, x, perm):
+        if isinstance(x, Tensor) and isinstance(perm, tuple) and len(perm) == len(x.shape) and \
+                perm == tuple(range(len(perm))):
+            ret = Identity()(x)
+            return (True, ret)
+        return (False, None)
+
 
 class ConjugateTranspose(Primitive):
     """
@@ -1310,18 +1346,21 @@ class Split(PrimitiveWithCheck):
 
     def __check__(self, x):
         validator.check_subclass("x", x['dtype'], mstype.tensor, self.name)
-        x_shape = list(x['shape'])
+        x_shape = x['shape']
         dim = len(x_shape)
         validator.check_int_range(self.axis, -dim, dim, Rel.INC_LEFT, 'axis value', self.name)
-        if is_shape_known(x_shape):
-            # only validate when shape fully known
-            output_valid_check = x_shape[self.axis] % self.output_num
-            if output_valid_check != 0:
-                raise ValueError(f"For '{self.name}', the specified axis of 'input_x' must be divided exactly by "
-                                 f"'output_num', but got the shape of 'input_x' in 'axis' {self.axis} is "
-                                 f"{x_shape[self.axis]}, 'output_num': {self.output_num}.")
-        size_splits = [x_shape[self.axis] // self.output_num] * self.output_num
-        self.add_prim_attr('size_splits', size_splits)
+        axis_dim = x_shape[self.axis]
+        split_size, remainder = divmod(axis_dim, self.output_num)
+        # only validate when shape fully known
+        if remainder != 0 and is_shape_known(x_shape):
+            raise ValueError(f"For '{self.name}', the specified axis of 'input_x' must be divided exactly by "
+                             f"'output_num', but got the shape of 'input_x' in 'axis' {self.axis} is "
+                             f"{axis_dim}, 'output_num': {self.output_num}.")
+        # the same Split is checked again on every re-inference, so only push size_splits when it changes
+        size_splits = self.attrs.get('size_splits')
+        if size_splits is None or len(size_splits) != self.output_num or \
+                any(size != split_size for size in size_splits):
+            self.add_prim_attr('size_splits', [split_size] * self.output_num)
 
 
 class Rank(PrimitiveWithInfer):
@@ -1378,19 +1417,18 @@ class Size(PrimitiveWithInfer):
         """Initialize Size"""
 
     def __infer__(self, x):
-        size = 1
         validator.check_subclass("x", x['dtype'], mstype.tensor, self.name)
         shp = x['shape']
-        if not shp:
-            size = 0
-        else:
-            size = functools.reduce(lambda x, y: x * y, x['shape'])
+        size = functools.reduce(operator.mul, shp) if shp else 0
         out = {'shape': None,
                'dtype': mstype.int64,
                'value': size}
         return out
 
 
+_MATRIX_DIAG_ALIGNS = ['LEFT_RIGHT', 'RIGHT_LEFT', 'LEFT_LEFT', 'RIGHT_RIGHT']
+
+
 class MatrixDiagV3(Primitive):
     """
     Returns a batched diagonal tensor with given batched diagonal values.
@@ -1423,7 +1461,7 @@ class MatrixDiagV3(Primitive):
     def __init__(self, align="RIGHT_LEFT"):
         """"Initialize MatrixDiagV3"""
         validator.check_value_type("align", align, [str], self.name)
-        validator.check_string(align, ['LEFT_RIGHT', 'RIGHT_LEFT', 'LEFT_LEFT', 'RIGHT_RIGHT'], 'align', self.name)
+        validator.check_string(align, _MATRIX_DIAG_ALIGNS, 'align', self.name)
         self.init_prim_io_names(inputs=['x', 'k', 'num_rows', 'num_cols', 'padding_value'], outputs=['y'])
 
 
@@ -1457,7 +1495,7 @@ class MatrixDiagPartV3(Primitive):
         """"Initialize MatrixDiagPartV3"""
         self.add_prim_attr("max_length", 200000000)
         validator.check_value_type("align", align, [str], self.name)
-        validator.check_string(align, ['LEFT_RIGHT', 'RIGHT_LEFT', 'LEFT_LEFT', 'RIGHT_RIGHT'], 'align', self.name)
+        validator.check_string(align, _MATRIX_DIAG_ALIGNS, 'align', self.name)
         self.init_prim_io_names(inputs=['x', 'k', 'padding_value'], outputs=['y'])
 
 
@@ -1536,7 +1574,7 @@ class MatrixSetDiagV3(Primitive):
         """"Initialize MatrixSetDiagV3"""
         self.add_prim_attr("max_length", 200000000)
         validator.check_value_type("align", align, [str], self.name)
-        validator.check_string(align, ['LEFT_RIGHT', 'RIGHT_LEFT', 'LEFT_LEFT', 'RIGHT_RIGHT'], 'align', self.name)
+        validator.check_string(align, _MATRIX_DIAG_ALIGNS, 'align', self.name)
         self.init_prim_io_names(inputs=['x', 'diagonal', 'k'], outputs=['y'])
 
 
@@ -1571,6 +1609,12 @@ class MatrixBandPart(Primitive):
         self.init_prim_io_names(inputs=['x', 'lower', 'upper'], outputs=['y'])
 
 
+_FILL_VALID_DTYPES = [mstype.bool_, mstype.int8, mstype.int16, mstype.int32, mstype.int64,
+                      mstype.uint8, mstype.uint16, mstype.uint32, mstype.uint64,
+                      mstype.float16, mstype.float32, mstype.float64, mstype.complex64,
+                      mstype.complex128]
+
+
 class Fill(PrimitiveWithInfer):
     """
     Create a Tensor of the specified shape and fill it with the specified value.
@@ -1600,18 +1644,14 @@ class Fill(PrimitiveWithInfer):
     def __infer__(self, dtype, dims, x):
         validator.check_value_type("shape", dims['value'], [tuple], self.name)
         validator.check_value_type("value", x['value'], [numbers.Number, bool], self.name)
-        valid_dtypes = [mstype.bool_, mstype.int8, mstype.int16, mstype.int32, mstype.int64,
-                        mstype.uint8, mstype.uint16, mstype.uint32, mstype.uint64,
-                        mstype.float16, mstype.float32, mstype.float64, mstype.complex64,
-                        mstype.complex128]
-        validator.check_types_same_and_valid({"value": dtype['value']}, valid_dtypes, self.name)
-        x_nptype = mstype.dtype_to_nptype(dtype['value'])
+        validator.check_types_same_and_valid({"value": dtype['value']}, _FILL_VALID_DTYPES, self.name)
         if is_shape_known(dims['value']):
-            for i, item in enumerate(dims['value']):
-                validator.check_positive_int(item, f'dims[{i}]', self.name)
-            ret = np.full(dims['value'], x['value'], x_nptype)
+            if not all(isinstance(item, int) and not isinstance(item, bool) and item > 0 for item in dims['value']):
+                for i, item in enumerate(dims['value']):
+                    validator.check_positive_int(item, f'dims[{i}]', self.name)
+            x_nptype = _dtype_to_nptype(dtype['value'])
             out = {
-                'value': Tensor(ret),
+                'value': Tensor(np.full(dims['value'], x['value'], x_nptype)),
                 'shape': dims['value'],
                 'dtype': x['dtype'],
             }
@@ -1804,9 +1844,11 @@ class TupleToArray(PrimitiveWithInfer):
         validator.check_value_type("x", x, [tuple], self.name)
         validator.check("size of x", len(x), '', 0, Rel.GT, self.name)
         dtype = type(x[0])
-        for i, item in enumerate(x):
-            validator.check_value_type(f"x[{i}]", item, [numbers.Number], self.name)
-        if not all(isinstance(item, dtype) for item in x):
+        # one pass for the common case, the per-element checks only run to report what is wrong
+        if not issubclass(dtype, numbers.Number) or dtype is bool or \
+                not all(isinstance(item, dtype) and not isinstance(item, bool) for item in x):
+            for i, item in enumerate(x):
+                validator.check_value_type(f"x[{i}]", item, [numbers.Number], self.name)
             raise TypeError(f"For \'{self.name}\', all elements of 'input_x' must be have same type.")
         if isinstance(x[0], int):
             ret = np.array(x, np.int32)
@@ -1815,12 +1857,9 @@ class TupleToArray(PrimitiveWithInfer):
         return Tensor(ret)
 
     def __call__(self, x):
-        args = list()
         if isinstance(x, range):
-            args.append(tuple(x))
-        else:
-            args.append(x)
-        return _run_op(self, self.name, args)
+            x = tuple(x)
+        return _run_op(self, self.name, (x,))
 
 
 class ScalarToArray(PrimitiveWithInfer):
@@ -1881,10 +1920,28 @@ class ScalarToTensor(PrimitiveWithInfer):
     def infer_value(self, x, dtype=mstype.float32):
         validator.check_value_type("x", x, [int, float], self.name)
         validator.check_subclass("dtype", dtype, mstype.number, self.name)
-        data_type = mstype.dtype_to_nptype(dtype)
+        data_type = _dtype_to_nptype(dtype)
         return Tensor(np.array(x, data_type))
 
 
+@functools.lru_cache(maxsize=256)
+def _invert_permutation(perm, prim_name):
+    """Check and invert the permutation `perm`, caching the result for permutations shared by many ops."""
+    z = sorted(perm)
+    duplicated = next((curr for prev, curr in zip(z, z[1:]) if prev == curr), None)
+    if duplicated is not None:
+        raise ValueError(f"For '{prim_name}', the 'input_x' can not contain duplicate values, "
+                         f"but got duplicated {duplicated} in the 'input_x'.")
+    validator.check(f'value min', min(perm), '', 0, Rel.EQ, prim_name)
+    validator.check(f'value max', max(perm), '', len(perm) - 1, Rel.EQ, prim_name)
+
+    # without duplicates, values in [0, n - 1] are a permutation, so it can be inverted by scattering
+    perm_arr = np.array(perm, np.int64)
+    y = np.empty_like(perm_arr)
+    y[perm_arr] = np.arange(perm_arr.size, dtype=np.int64)
+    return tuple(y.tolist())
+
+
 class InvertPermutation(PrimitiveWithInfer):
     r"""
     Computes the inverse of an index permutation.
@@ -1941,27 +1998,15 @@ class InvertPermutation(PrimitiveWithInfer):
             if shp:
                 x_rank = len(np.array(x_value, np.int64).shape)
                 raise ValueError(f"For \'{self.name}\', the dimension of 'input_x' must be 1, but got {x_rank}.")
-        for i, value in enumerate(x_value):
-            validator.check_value_type("input[%d]" % i, value, [int], self.name)
-        z = [x_value[i] for i in range(len(x_value))]
-        z.sort()
-
-        for i in range(1, len(z)):
-            if z[i - 1] == z[i]:
-                raise ValueError(f"For '{self.name}', the 'input_x' can not contain duplicate values, "
-                                 f"but got duplicated {z[i]} in the 'input_x'.")
-        validator.check(f'value min', min(x_value), '', 0, Rel.EQ, self.name)
-        validator.check(f'value max', max(x_value), '', len(x_value) - 1, Rel.EQ, self.name)
-
-        y = [None] * len(x_value)
-        for i, value in enumerate(x_value):
-            validator.check_value_type("input[%d]" % i, value, [int], self.name)
-            validator.check(f'value', z[i], f'index', i, Rel.EQ, self.name)
-            y[value] = i
-            z.append(value)
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in x_value):
+            for i, value in enumerate(x_value):
+                validator.check_value_type("input[%d]" % i, value, [int], self.name)
         return {'shape': x_shp,
                 'dtype': x['dtype'],
-                'value': tuple(y)}
+                'value': _invert_permutation(tuple(x_value), self.name)}
+
+
+_ARGMAX_VALID_DTYPES = [mstype.float16, mstype.float32, mstype.float64]
 
 
 class Argmax(PrimitiveWithInfer):
@@ -2017,12 +2062,11 @@ class Argmax(PrimitiveWithInfer):
         x_rank = len(x_shape)
         validator.check_int_range(axis, -x_rank, x_rank, Rel.INC_LEFT, "axis", self.name)
         axis = axis + x_rank if axis < 0 else axis
-        ouput_shape = [x_shape[i] for i in range(x_rank) if i != axis]
-        return ouput_shape
+        output_shape = list(x_shape[:axis]) + list(x_shape[axis + 1:])
+        return output_shape
 
     def infer_dtype(self, x_dtype):
-        validator.check_tensor_dtype_valid("input_x", x_dtype, [mstype.float16, mstype.float32, mstype.float64],
-                                           self.name)
+        validator.check_tensor_dtype_valid("input_x", x_dtype, _ARGMAX_VALID_DTYPES, self.name)
         return mstype.tensor_type(self.output_type)
 
 
@@ -2122,9 +2166,7 @@ class ArgminV2(Primitive):
         self.init_prim_io_names(inputs=['x', 'axis'], outputs=['y'])
 
     def __call__(self, x, axis=-1):
-        args = [x, axis]
-        output = _run_op(self, self.name, args)
-        return output
+        return _run_op(self, self.name, (x, axis))
 
 
 class ArgMaxWithValue(Primitive):
@@ -2250,6 +2292,15 @@ class ArgMinWithValue(Primitive):
         validator.check_value_type('axis', axis, [int], self.name)
 
 
+_TILE_FOLD_MAX_BYTES = 1 << 24
+
+
+@functools.lru_cache(maxsize=32)
+def _ones_tuple(length):
+    """Return a cached tuple of `length` ones, so comparing multiples against it does not allocate."""
+    return (1,) * length
+
+
 class Tile(PrimitiveWithInfer):
     r"""
     Replicates an input tensor with given multiples times.
@@ -2295,11 +2346,24 @@ class Tile(PrimitiveWithInfer):
         if not isinstance(base_tensor, Tensor):
             raise TypeError(f"For '{self.name}', the type of 'input_x' must be Tensor, "
                             f"but got {type(base_tensor).__name__}.")
-        if all(v == 1 for v in multiplier) and len(base_tensor.shape) >= len(multiplier):
+        if isinstance(multiplier, tuple):
+            all_ones = multiplier == _ones_tuple(len(multiplier))
+        else:
+            all_ones = all(v == 1 for v in multiplier)
+        if all_ones and len(base_tensor.shape) >= len(multiplier):
             ret = Identity()(base_tensor)
             return (True, ret)
         return (False, None)
 
+    def _get_multiples_len_sub(self, multiples_v, x_shp):
+        """get how many leading dims `multiples` has more than `input_x`"""
+        len_sub = len(multiples_v) - len(x_shp)
+        if len_sub < 0:
+            raise ValueError(f"For '{self.name}', the length of 'multiples' can not be smaller than "
+                             f"the dimension of 'input_x', but got length of 'multiples': {len(multiples_v)} "
+                             f"and dimension of 'input_x': {len(x_shp)}.")
+        return len_sub
+
     def _get_shape_and_range(self, x, multiples):
         """calculate tile shape and value"""
         x_shp = x['shape']
@@ -2313,20 +2377,13 @@ class Tile(PrimitiveWithInfer):
         else:
             max_shape = list(x_shp)
             min_shape = list(x_shp)
-        len_sub = len(multiples_v) - len(x_shp)
-        multiples_w = None
-        if len_sub == 0:
-            multiples_w = multiples_v
+        len_sub = self._get_multiples_len_sub(multiples_v, x_shp)
+        multiples_w = multiples_v
         if len_sub > 0:
-            for i in range(0, len_sub):
-                x_shp.insert(0, 1)
-                min_shape.insert(0, 1)
-                max_shape.insert(0, 1)
-            multiples_w = multiples_v
-        elif len_sub < 0:
-            raise ValueError(f"For '{self.name}', the length of 'multiples' can not be smaller than "
-                             f"the dimension of 'input_x', but got length of 'multiples': {len(multiples_v)} "
-                             f"and dimension of 'input_x': {len(x_shp)}.")
+            pad = [1] * len_sub
+            x_shp[:0] = pad
+            min_shape[:0] = pad
+            max_shape[:0] = pad
         if 'max_value' in multiples and 'min_value' in multiples:
             multiples_v_max = multiples['max_value']
             multiples_v_min = multiples['min_value']
@@ -2350,7 +2407,11 @@ class Tile(PrimitiveWithInfer):
                 max_shape[i] *= a
                 min_shape[i] *= a
             if x['value'] is not None:
-                value = Tensor(np.tile(x['value'].asnumpy(), multiples_w))
+                x_value = x['value'].asnumpy()
+                out_bytes = x_value.itemsize * functools.reduce(operator.mul, multiples_w, x_value.size)
+                # leave large results to the Tile kernel instead of materializing them while inferring
+                if out_bytes <= _TILE_FOLD_MAX_BYTES:
+                    value = Tensor(np.tile(x_value, multiples_w))
         out_shape = {
             'shape': x_shp,
             'max_shape': max_shape,
@@ -2392,6 +2453,15 @@ class Tile(PrimitiveWithInfer):
                 multiple, "multiples[%d]" % i, self.name)
         validator.check_value_type(
             "x[\'dtype\']", x["dtype"], mstype.tensor_type, self.name)
+        if x['value'] is None and 'max_shape' not in x and 'min_shape' not in x and 'max_value' not in multiples:
+            # static multiples without ranges or a constant to fold only need the output shape
+            x_shp = x['shape']
+            len_sub = self._get_multiples_len_sub(multiples_v, x_shp)
+            x_shp = [1] * len_sub + list(x_shp)
+            out_shp = [dim * multiple if dim >= 0 else dim for dim, multiple in zip(x_shp, multiples_v)]
+            return {'shape': out_shp,
+                    'dtype': x['dtype'],
+                    'value': None}
         out_shp, value = self._get_shape_and_range(x, multiples)
         shp = out_shp.get('shape', None)
         out = {'shape': shp,
@@ -2739,7 +2809,7 @@ class Concat(PrimitiveWithCheck):
     def infer_value(self, input_x):
         value = None
         if input_x is not None:
-            value = Tensor(np.concatenate([x.asnumpy() for x in input_x], axis=self.axis))
+            value = Tensor.from_numpy(np.concatenate([x.asnumpy() for x in input_x], axis=self.axis))
         return value
 
 
@@ -2798,7 +2868,8 @@ class ParallelConcat(PrimitiveWithInfer):
         for i, elem in enumerate(x_shp[1:]):
             j = i + 1
             validator.check_equal_int(elem[0], 1, f'x_shp[{j}][0]', self.name)
-            validator.check(f"x_shp[0] shape", first_elem, f"x_shp[{j}] shape", elem, Rel.EQ, self.name)
+            if elem != first_elem:
+                validator.check(f"x_shp[0] shape", first_elem, f"x_shp[{j}] shape", elem, Rel.EQ, self.name)
 
         ret_shp = x_shp[0].copy()
         ret_shp[0] = len(x_shp)
@@ -2847,6 +2918,15 @@ def _get_stack_shape(value, x_shape, x_type, axis, prim_name):
     return out_shape
 
 
+def _stack_bound_to_numpy(bound):
+    """Convert an element of Stack's min_value/max_value to a numpy-compatible value."""
+    if isinstance(bound, Tensor_):
+        return bound.asnumpy()
+    if isinstance(bound, tuple):
+        return np.array(bound)
+    return bound
+
+
 class Pack(PrimitiveWithInfer):
     """
     Same as operator Stack. Pack will be deprecated in the future.
@@ -2905,13 +2985,9 @@ class Stack(PrimitiveWithInfer):
         all_shape = _get_stack_shape(value, x_shape, x_type, self.axis, self.name)
         out = {}
         tuple_value = value['value']
-        input_array = []
         infered_value = None
         if tuple_value is not None:
-            for item in tuple_value:
-                npy_item = item.asnumpy()
-                input_array.append(npy_item)
-            infered_value = Tensor(np.stack(input_array, axis=self.axis))
+            infered_value = Tensor.from_numpy(np.stack([item.asnumpy() for item in tuple_value], axis=self.axis))
 
         if 'min_shape' in all_shape and 'max_shape' in all_shape:
             out = {'shape': all_shape.get('shape'),
@@ -2926,31 +3002,13 @@ class Stack(PrimitiveWithInfer):
                    'value': infered_value}
 
         if 'min_value' in value and 'max_value' in value:
-            min_value_array = []
-            max_value_array = []
-            infered_min_value = None
-            infered_max_value = None
-            for i in range(len(value['min_value'])):
-                cur_min_value = value['min_value'][i]
-                cur_max_value = value['max_value'][i]
-                if cur_min_value is None or cur_max_value is None:
-                    return out
-                if isinstance(cur_min_value, Tensor_):
-                    cur_min_value = cur_min_value.asnumpy()
-                elif isinstance(cur_min_value, tuple):
-                    cur_min_value = np.array(cur_min_value)
-                if isinstance(cur_max_value, Tensor_):
-                    cur_max_value = cur_max_value.asnumpy()
-                elif isinstance(cur_max_value, tuple):
-                    cur_max_value = np.array(cur_max_value)
-                min_value_array.append(cur_min_value)
-                max_value_array.append(cur_max_value)
-            infered_min_value = np.stack(min_value_array, axis=self.axis)
-            infered_max_value = np.stack(max_value_array, axis=self.axis)
-            infered_min_value = tuple(infered_min_value.tolist())
-            infered_max_value = tuple(infered_max_value.tolist())
-            out['min_value'] = infered_min_value
-            out['max_value'] = infered_max_value
+            min_value, max_value = value['min_value'], value['max_value']
+            if any(item is None for item in min_value) or any(item is None for item in max_value):
+                return out
+            infered_min_value = np.stack([_stack_bound_to_numpy(item) for item in min_value], axis=self.axis)
+            infered_max_value = np.stack([_stack_bound_to_numpy(item) for item in max_value], axis=self.axis)
+            out['min_value'] = tuple(infered_min_value.tolist())
+            out['max_value'] = tuple(infered_max_value.tolist())
         return out
 
 
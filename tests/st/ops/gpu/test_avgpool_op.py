@@ -343,6 +343,24 @@ def test_avgpool_grad_vmap():
     assert out[0].shape == (6, 3, 1, 1, 6, 6)
 
 
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("pad_mode", ["VALID", "SAME"])
+def test_avgpool_vmap_static_shape(pad_mode):
+    """
+    Feature: test vmap function.
+    Description: test avgpool op vmap with static shape.
+    Expectation: expect the same result as running avgpool on each batch.
+    """
+    x = np.random.randn(3, 1, 2, 7, 7).astype(np.float32)
+    net = AvgPool(dim=2, kernel_size=3, strides=2, pad_mode=pad_mode)
+    out = vmap(net, in_axes=0, out_axes=0)(Tensor(x))
+    expect = np.stack([net(Tensor(x[i])).asnumpy() for i in range(x.shape[0])])
+    assert out.shape == expect.shape
+    assert np.allclose(out.asnumpy(), expect)
+
+
 class DynamicShapeAvgPool3DGrad(nn.Cell):
     def __init__(self, net, axis=0):
         super(DynamicShapeAvgPool3DGrad, self).__init__()
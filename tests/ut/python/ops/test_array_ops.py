@@ -25,6 +25,7 @@ from mindspore import ops
 from mindspore.ops import operations as P
 from mindspore.ops import prim_attr_register
 from mindspore.ops.operations import _inner_ops as inner
+from mindspore.ops.operations import array_ops
 from mindspore.ops.primitive import PrimitiveWithInfer
 from mindspore.ops.signature import sig_rw, sig_dtype, make_sig
 
@@ -93,6 +94,33 @@ def test_reshape():
     assert output.asnumpy().shape == (3, 2)
 
 
+def test_cast_infer_scalar_value_range():
+    """
+    Feature: Cast infer.
+    Description: Infer Cast of a scalar constant whose min_value and max_value are scalars.
+    Expectation: the value range is cast to the destination type and returned as tuples.
+    """
+    cast = P.Cast()
+    x = {'shape': [], 'dtype': mstype.float32, 'value': 2.5, 'min_value': 1.5, 'max_value': 3.5}
+    out = cast.__infer__(x, {'value': mstype.int32})
+    assert out['value'].asnumpy() == 2
+    assert out['min_value'] == (1,)
+    assert out['max_value'] == (3,)
+
+
+def test_reshape_infer_unknown_shape_without_range():
+    """
+    Feature: Reshape infer.
+    Description: Reshape an input with an unknown dim and no min/max shape to a shape with -1.
+    Expectation: the -1 dim of the shape range is rounded toward zero, not to the dynamic rank value -2.
+    """
+    reshape = P.Reshape()
+    x = {'shape': [-1, 3], 'dtype': mstype.tensor_type(mstype.float32), 'value': None}
+    out = reshape.__infer__(x, {'value': (-1, 2)})
+    assert out['max_shape'] == (-1, 2)
+    assert out['min_shape'] == (-1, 2)
+
+
 def test_transpose():
     input_tensor = Tensor(np.array([[[1, 2, 3], [4, 5, 6]], [[7, 8, 9], [10, 11, 12]]]))
     perm = (0, 2, 1)
@@ -103,6 +131,45 @@ def test_transpose():
     assert np.all(output.asnumpy() == expect)
 
 
+def test_transpose_check_elim():
+    """
+    Feature: Transpose check_elim.
+    Description: Transpose with an identity perm and with a non-identity perm.
+    Expectation: only the identity perm is eliminated, returning the input values unchanged.
+    """
+    input_np = np.arange(24).reshape((2, 3, 4)).astype(np.float32)
+    transpose = P.Transpose()
+    elim, output = transpose.check_elim(Tensor(input_np), (0, 1, 2))
+    assert elim
+    assert np.all(output.asnumpy() == input_np)
+    assert transpose.check_elim(Tensor(input_np), (0, 2, 1)) == (False, None)
+    assert transpose.check_elim(Tensor(input_np), (0, 1)) == (False, None)
+    output = transpose(Tensor(input_np), (0, 1, 2))
+    assert np.all(output.asnumpy() == input_np)
+
+
+def test_tile_infer_fold_budget(monkeypatch):
+    """
+    Feature: Tile constant folding.
+    Description: Infer Tile of a constant whose tiled result is below and above the folding budget.
+    Expectation: the result is folded only when it fits in the budget, the output shape is inferred either way.
+    """
+    monkeypatch.setattr(array_ops, "_TILE_FOLD_MAX_BYTES", 64)
+    input_np = np.arange(6).reshape((2, 3)).astype(np.float32)
+    tile = P.Tile()
+
+    def infer(multiples):
+        x = {'shape': [2, 3], 'dtype': mstype.tensor_type(mstype.float32), 'value': Tensor(input_np)}
+        return tile.__infer__(x, {'shape': (len(multiples),), 'value': multiples})
+
+    out = infer((1, 2))
+    assert list(out['shape']) == [2, 6]
+    assert np.all(out['value'].asnumpy() == np.tile(input_np, (1, 2)))
+    out = infer((2, 2))
+    assert list(out['shape']) == [4, 6]
+    assert out['value'] is None
+
+
 def test_squeeze():
     input_tensor = Tensor(np.ones(shape=[3, 2, 1]))
     squeeze = P.Squeeze(2)
@@ -118,6 +185,38 @@ def test_invert_permutation():
     assert np.all(output == expect)
 
 
+def test_invert_permutation_duplicate_checked_before_range():
+    """
+    Feature: InvertPermutation infer.
+    Description: The input contains duplicates and values out of range at the same time.
+    Expectation: throw ValueError about the duplicate values, which are checked before the value range.
+    """
+    invert_permutation = P.InvertPermutation()
+    with pytest.raises(ValueError, match="duplicate"):
+        invert_permutation((0, 0, 3))
+
+
+def test_tuple_to_array_mixed_types():
+    """
+    Feature: TupleToArray infer_value.
+    Description: Tuples of a single number type or its subclasses, and tuples mixing int, bool and float.
+    Expectation: single-type tuples are converted, mixed tuples and bools raise TypeError.
+    """
+    to_array = P.TupleToArray()
+    output = to_array.infer_value((1, 2, 3))
+    assert output.dtype == mstype.int32
+    assert np.all(output.asnumpy() == np.array([1, 2, 3]))
+    output = to_array.infer_value((1.0, 2.5))
+    assert output.dtype == mstype.float32
+    assert np.allclose(output.asnumpy(), np.array([1.0, 2.5]))
+    output = to_array.infer_value((1.0, np.float64(2.0)))
+    assert output.dtype == mstype.float32
+    assert np.allclose(output.asnumpy(), np.array([1.0, 2.0]))
+    for x in [(1, 2.0), (1.0, 2), (1, True), (True, 1), (True, False), (1, 2.0, False)]:
+        with pytest.raises(TypeError):
+            to_array.infer_value(x)
+
+
 def test_select():
     select = P.Select()
     cond = Tensor(np.array([[True, False, False], [False, True, True]]))
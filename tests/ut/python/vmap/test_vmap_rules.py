@@ -0,0 +1,56 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test vmap rules of nn operations"""
+import numpy as np
+import pytest
+import mindspore.ops.operations as P
+from mindspore import Tensor
+from mindspore import dtype as mstype
+from mindspore.ops._vmap import get_vmap_rule
+
+
+def _bdims(*dims):
+    x = Tensor(np.ones((2, 3)), mstype.float32)
+    return [(x, dim) for dim in dims]
+
+
+@pytest.mark.parametrize("prim, input_num", [(P.ApplyAdadelta(), 7), (P.ApplyFtrl(), 8),
+                                             (P.ApplyProximalAdagrad(), 6),
+                                             (P.ApplyProximalGradientDescent(), 5)])
+def test_optimizer_rule_var_axis_none(prim, input_num):
+    """
+    Feature: vmap rules of optimizer operations
+    Description: The source axis of `var` is None, but the source axis of another input is not None.
+    Expectation: throw ValueError:"The source axis of `var` is None".
+    """
+    vmap_rule = get_vmap_rule(prim, 2)
+    inputs = _bdims(None, *([0] * (input_num - 1)))
+    with pytest.raises(ValueError) as ex:
+        vmap_rule(*inputs, None)
+    assert "The source axis of `var` is None" in str(ex.value)
+
+
+@pytest.mark.parametrize("prim, input_num", [(P.ApplyAdadelta(), 7), (P.ApplyFtrl(), 8)])
+def test_optimizer_rule_var_axis_not_zero(prim, input_num):
+    """
+    Feature: vmap rules of optimizer operations
+    Description: The source axis of `var` is not 0.
+    Expectation: throw ValueError:"source axis of `var".
+    """
+    vmap_rule = get_vmap_rule(prim, 2)
+    inputs = _bdims(1, *([1] * (input_num - 1)))
+    with pytest.raises(ValueError) as ex:
+        vmap_rule(*inputs, None)
+    assert "source axis of `var" in str(ex.value)